@@ -4,13 +4,21 @@ Modular configuration with clear separation of concerns
 """
 
 from config.environment import api_config, ApiConfig, ConfigurationError
-from config.prompts import SYSTEM_INSTRUCTIONS, load_system_instructions
+from config.prompts import get_system_instructions, load_system_instructions
 from config.gemini_config import get_gemini_config, validate_voice_name
 
 # Backward compatibility - export commonly used values
 MODEL = api_config.model
 VOICE = api_config.voice
 
+
+def __getattr__(name: str):
+    """PEP 562: SYSTEM_INSTRUCTIONS is built on first access, not at import."""
+    if name == 'SYSTEM_INSTRUCTIONS':
+        return get_system_instructions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     # Environment
     'api_config',
@@ -19,6 +27,7 @@ __all__ = [
 
     # Prompts
     'SYSTEM_INSTRUCTIONS',
+    'get_system_instructions',
     'load_system_instructions',
 
     # Gemini Config
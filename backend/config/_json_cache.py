@@ -0,0 +1,93 @@
+"""
+Process-wide memoized JSON file loader
+Each config/data file is parsed once per (path, mtime, size)
+Also provides orjson-backed (de)serialization helpers with stdlib fallback
+"""
+
+import os
+import json
+import functools
+from pathlib import Path
+from typing import Union
+
+# Optional: orjson is a much faster C parser (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, str]):
+    """Parse JSON bytes/text with orjson when installed, stdlib json otherwise."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj) -> str:
+    """Serialize compact JSON text with orjson when installed, stdlib json otherwise (same output)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False)
+
+
+def dumps_indented(obj) -> str:
+    """Pretty-print JSON with 2-space indent (non-ASCII kept as-is in both paths)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_json_file(path: str, mtime_ns: int, size: int) -> dict:
+    """Parse a JSON file. Cached on path + mtime + size so edits are picked up."""
+    return loads(Path(path).read_bytes())
+
+
+def get_json(path: Path) -> dict:
+    """
+    Load a JSON file through the process-wide cache.
+
+    The returned dict is shared between callers - treat it as read-only.
+
+    Raises:
+        OSError: If the file cannot be stat'ed or read
+        ValueError: If the file is not valid JSON
+    """
+    stat = os.stat(path)
+    return _parse_json_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=32)
+def _indent_json_file(path: str, mtime_ns: int, size: int) -> str:
+    """Pretty-printed text of a JSON file, cached alongside the parsed dict."""
+    return dumps_indented(_parse_json_file(path, mtime_ns, size))
+
+
+def get_json_indented(path: Path) -> str:
+    """
+    Get a JSON file re-serialized with 2-space indent (see dumps_indented).
+
+    Serialized once per file version, so repeated callers share one string.
+    """
+    stat = os.stat(path)
+    return _indent_json_file(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def file_stat_key(*paths) -> tuple:
+    """Cache key from (path, mtime_ns, size) of each path; None for missing/unset paths."""
+    key = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            key.append((str(path), stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            key.append(None)
+    return tuple(key)
+
+
+def clear_json_cache() -> None:
+    """Drop every cached parse/serialization (tests, forced reloads)."""
+    _parse_json_file.cache_clear()
+    _indent_json_file.cache_clear()
@@ -0,0 +1,40 @@
+"""
+Shared paths and backend_config.json loader
+Single source of truth for every module that reads backend configuration
+"""
+
+import logging
+from pathlib import Path
+
+from config._json_cache import get_json
+
+logger = logging.getLogger(__name__)
+
+# Backend directory and data file locations (resolved once at import)
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = BACKEND_DIR.parent
+BACKEND_CONFIG_PATH = BACKEND_DIR / 'backend_config.json'
+FRONTEND_CONFIG_PATH = REPO_ROOT / 'frontend' / 'frontend_config.json'
+SET_LIST_PATH = BACKEND_DIR / 'set-list.json'
+
+# Backstory candidates in probe order: backend dir (cloud deployment), then docs (local development)
+BACKSTORY_PATHS = (
+    BACKEND_DIR / 'whinny_backstory.json',
+    REPO_ROOT / 'docs' / 'whinny_backstory.json',
+)
+
+
+def load_backend_config() -> dict:
+    """
+    Load backend_config.json (memoized; re-parsed only when the file changes).
+
+    Returns an empty dict if the file is missing or invalid. The returned
+    dict is shared between callers - treat it as read-only.
+    """
+    try:
+        if BACKEND_CONFIG_PATH.exists():
+            return get_json(BACKEND_CONFIG_PATH)
+        return {}
+    except Exception as e:
+        logger.error("Failed to load config: %s", e)
+        return {}
@@ -4,11 +4,12 @@ Uses API Key authentication (not Vertex AI)
 """
 
 import os
-import json
 import logging
-from pathlib import Path
 from dotenv import load_dotenv
 
+from config._json_cache import get_json
+from config._shared import BACKEND_CONFIG_PATH, FRONTEND_CONFIG_PATH, load_backend_config
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -23,16 +24,12 @@ class ConfigurationError(Exception):
 def load_config_json() -> dict:
     """Load configuration from backend_config.json and frontend_config.json."""
     # Try backend directory first (for cloud deployment)
-    backend_config_path = Path(__file__).parent.parent / 'backend_config.json'
-    if backend_config_path.exists():
-        with open(backend_config_path, 'r') as f:
-            return json.load(f)
+    if BACKEND_CONFIG_PATH.exists():
+        return load_backend_config()
 
     # Fall back to frontend directory (for local development)
-    frontend_config_path = Path(__file__).parent.parent.parent / 'frontend' / 'frontend_config.json'
-    if frontend_config_path.exists():
-        with open(frontend_config_path, 'r') as f:
-            return json.load(f)
+    if FRONTEND_CONFIG_PATH.exists():
+        return get_json(FRONTEND_CONFIG_PATH)
 
     return {}
 
@@ -3,23 +3,65 @@ Gemini Live API configuration builder
 100% SDK-compliant implementation based on official Google Gen AI SDK
 """
 
+import sys
 import logging
-import json
-from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Tuple
 from google.genai import types
+from config._json_cache import file_stat_key
+from config._shared import BACKEND_CONFIG_PATH, load_backend_config
 from config.environment import api_config
-from config.prompts import SYSTEM_INSTRUCTIONS
+from config.prompts import PERSONA_CHARACTER_NAME, get_system_instructions
 
 logger = logging.getLogger(__name__)
 
+# Supported Gemini prebuilt voices (hash lookup, built once)
+VALID_VOICES = frozenset({
+    # Original voices
+    'Puck', 'Charon', 'Kore', 'Fenrir', 'Aoede',
+    'Zubenelgenubi', 'Orion', 'Pegasus', 'Vega',
+    # Additional Gemini 2.0 voices
+    'Algenib', 'Alkaid', 'Altair', 'Castor', 'Polaris'
+})
+
+# FUNCTION CALLING: Tools that Gemini can call (built once, shared by all sessions)
+# Dance mode tool allows Gemini to trigger dance sequence
+# Goodbye mode tool triggers farewell sequence
+TOOLS = [
+    {
+        "function_declarations": [
+            {
+                "name": "trigger_dance_mode",
+                "description": "Triggers the avatar's dance mode, playing music and showing a dance animation for 10 seconds. IMPORTANT: You MUST continue speaking enthusiastically about dancing while calling this function - the dance music plays quietly in the background so the user can still hear you. Use this when the user asks to dance, mentions dancing, or requests dance music. Parameters are empty (no configuration needed).",
+                "parameters": {
+                    "type": "OBJECT",
+                    "properties": {},
+                    "required": []
+                }
+            },
+            {
+                "name": "trigger_goodbye_mode",
+                "description": "Triggers the avatar's goodbye sequence with a farewell animation. IMPORTANT: You MUST say ONLY the exact phrase 'See you later!' while calling this function - nothing more, nothing less. Use this when the user says goodbye, farewell, bye, see ya, or indicates they are leaving. Parameters are empty (no configuration needed).",
+                "parameters": {
+                    "type": "OBJECT",
+                    "properties": {},
+                    "required": []
+                }
+            }
+        ]
+    }
+]
 
-def load_config_json() -> dict:
-    """Load configuration from backend_config.json."""
-    backend_config_path = Path(__file__).parent.parent / 'backend_config.json'
-    if backend_config_path.exists():
-        with open(backend_config_path, 'r') as f:
-            return json.load(f)
-    return {}
+# AUTOMATIC VAD: backend_config.json automaticVAD key -> (SDK key, default)
+VAD_DEFAULTS = MappingProxyType({
+    "startOfSpeechSensitivity": ("start_of_speech_sensitivity", "START_SENSITIVITY_HIGH"),
+    "endOfSpeechSensitivity": ("end_of_speech_sensitivity", "END_SENSITIVITY_HIGH"),
+    "prefixPaddingMs": ("prefix_padding_ms", 100),
+    "silenceDurationMs": ("silence_duration_ms", 200),
+})
+
+# Last built config: (backend_config.json stat key, system instructions, config)
+_cached_config: Optional[Tuple[tuple, str, dict]] = None
 
 
 def validate_voice_name(voice_name: str) -> bool:
@@ -31,17 +73,72 @@ def validate_voice_name(voice_name: str) -> bool:
                                   Zubenelgenubi, Orion, Pegasus, Vega,
                                   Algenib, Alkaid, Altair, Castor, Polaris
     """
-    valid_voices = [
-        # Original voices
-        'Puck', 'Charon', 'Kore', 'Fenrir', 'Aoede',
-        'Zubenelgenubi', 'Orion', 'Pegasus', 'Vega',
-        # Additional Gemini 2.0 voices
-        'Algenib', 'Alkaid', 'Altair', 'Castor', 'Polaris'
-    ]
-    return voice_name in valid_voices
+    return voice_name in VALID_VOICES
+
+
+def log_system_instruction_debug(config: dict) -> None:
+    """DEBUG: Dump the system_instruction in config (emptiness is checked by the caller)."""
+    logger.debug("="*80)
+    logger.debug("🔍 GEMINI CONFIG DEBUG - SYSTEM INSTRUCTION")
+    logger.debug("="*80)
+    si_value = config["system_instruction"]
+    logger.debug("✅ system_instruction present in config")
+    logger.debug("✅ system_instruction type: %s", type(si_value))
+
+    # Handle Content object
+    if isinstance(si_value, types.Content):
+        logger.debug("✅ system_instruction is Content object (correct format)")
+        logger.debug("   Role: %s", si_value.role)
+        logger.debug("   Parts: %s part(s)", len(si_value.parts))
+        if si_value.parts:
+            first_part = si_value.parts[0]
+            if hasattr(first_part, 'text'):
+                text_content = first_part.text
+                logger.debug("   Text length: %s characters", len(text_content))
+                if PERSONA_CHARACTER_NAME in text_content:
+                    logger.debug("✅ '%s' found in Content object text", PERSONA_CHARACTER_NAME)
+                else:
+                    logger.error(f"❌ '{PERSONA_CHARACTER_NAME}' NOT found in Content object text!")
+                logger.debug("First 300 chars of system_instruction text:")
+                logger.debug(text_content[:300])
+    # Handle string (fallback)
+    elif isinstance(si_value, str):
+        logger.debug("⚠️ system_instruction is string (should be Content object?)")
+        logger.debug("   Length: %s characters", len(si_value))
+        if PERSONA_CHARACTER_NAME in si_value:
+            logger.debug("✅ '%s' found in string", PERSONA_CHARACTER_NAME)
+        else:
+            logger.error(f"❌ '{PERSONA_CHARACTER_NAME}' NOT found in string!")
+        logger.debug("First 300 chars:")
+        logger.debug(si_value[:300])
+    else:
+        logger.warning(f"⚠️ Unexpected system_instruction type: {type(si_value)}")
+    logger.debug("="*80)
 
 
 def get_gemini_config() -> dict:
+    """
+    Get the Gemini Live API configuration, building it on first use.
+
+    The config is cached and only rebuilt when backend_config.json changes on
+    disk or get_system_instructions() hands back a different string (it
+    reloads when the backstory changes). The returned dict is shared between
+    sessions - treat it as read-only.
+    """
+    global _cached_config
+
+    system_instructions = get_system_instructions()
+    key = file_stat_key(BACKEND_CONFIG_PATH)
+    if (_cached_config is not None and _cached_config[0] == key
+            and _cached_config[1] is system_instructions):
+        return _cached_config[2]
+
+    config = build_gemini_config(system_instructions)
+    _cached_config = (key, system_instructions, config)
+    return config
+
+
+def build_gemini_config(system_instructions: str) -> dict:
     """
     Create 100% SDK-compliant Gemini Live API configuration.
 
@@ -51,6 +148,10 @@ def get_gemini_config() -> dict:
     Voice is configured ONLY via frontend/frontend_config.json → geminiVoice.voiceName
     No environment variable fallbacks.
 
+    Args:
+        system_instructions: Persona text from get_system_instructions(); the
+                             same string get_gemini_config() caches the result under
+
     Returns:
         Plain dictionary config (NOT typed objects)
     """
@@ -66,6 +167,10 @@ def get_gemini_config() -> dict:
             f"Update geminiVoice.voiceName in frontend/frontend_config.json"
         )
 
+    # Intern so downstream dict lookups/comparisons on the voice hit the fast path
+    # (the VALID_VOICES literals are already interned by the compiler)
+    voice_name = sys.intern(voice_name)
+
     # OFFICIAL GOOGLE PATTERN: speech_config as dictionary object
     # Reference: https://ai.google.dev/gemini-api/docs/audio
     # The SDK requires speech_config to be a dictionary with voice_name
@@ -75,7 +180,7 @@ def get_gemini_config() -> dict:
     # Let's try Content object first as it's more explicit
     system_instruction_as_content = types.Content(
         role="user",
-        parts=[types.Part(text=SYSTEM_INSTRUCTIONS)]
+        parts=[types.Part(text=system_instructions)]
     )
 
     config = {
@@ -97,107 +202,43 @@ def get_gemini_config() -> dict:
     if api_config.affective_dialog:
         config["enable_affective_dialog"] = True
 
-    # FUNCTION CALLING: Define tools that Gemini can call
-    # Dance mode tool allows Gemini to trigger dance sequence
-    # Goodbye mode tool triggers farewell sequence
-    config["tools"] = [
-        {
-            "function_declarations": [
-                {
-                    "name": "trigger_dance_mode",
-                    "description": "Triggers the avatar's dance mode, playing music and showing a dance animation for 10 seconds. IMPORTANT: You MUST continue speaking enthusiastically about dancing while calling this function - the dance music plays quietly in the background so the user can still hear you. Use this when the user asks to dance, mentions dancing, or requests dance music. Parameters are empty (no configuration needed).",
-                    "parameters": {
-                        "type": "OBJECT",
-                        "properties": {},
-                        "required": []
-                    }
-                },
-                {
-                    "name": "trigger_goodbye_mode",
-                    "description": "Triggers the avatar's goodbye sequence with a farewell animation. IMPORTANT: You MUST say ONLY the exact phrase 'See you later!' while calling this function - nothing more, nothing less. Use this when the user says goodbye, farewell, bye, see ya, or indicates they are leaving. Parameters are empty (no configuration needed).",
-                    "parameters": {
-                        "type": "OBJECT",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            ]
-        }
-    ]
+    # FUNCTION CALLING: Shared module-level declarations (see TOOLS)
+    config["tools"] = TOOLS
 
     # CAPTIONS/TRANSCRIPTION: Enable Gemini's built-in output audio transcription
     # This provides real-time transcription of the model's spoken responses
-    config_json = load_config_json()
+    config_json = load_backend_config()
     captions_config = config_json.get("captions", {})
     if captions_config.get("enabled", True):
         config["output_audio_transcription"] = {}
-        logger.info(f"   Output audio transcription: Enabled (Gemini built-in)")
+        logger.debug("   Output audio transcription: Enabled (Gemini built-in)")
 
     # AUTOMATIC VAD: Configure automatic voice activity detection
     # Gemini will automatically detect when user starts/stops speaking
     vad_config = config_json.get("automaticVAD", {})
     if vad_config.get("enabled", True):
+        activity_detection = {"disabled": False}
+        for json_key, (sdk_key, default) in VAD_DEFAULTS.items():
+            activity_detection[sdk_key] = vad_config.get(json_key, default)
         config["realtime_input_config"] = {
-            "automatic_activity_detection": {
-                "disabled": False,
-                "start_of_speech_sensitivity": vad_config.get("startOfSpeechSensitivity", "START_SENSITIVITY_HIGH"),
-                "end_of_speech_sensitivity": vad_config.get("endOfSpeechSensitivity", "END_SENSITIVITY_HIGH"),
-                "prefix_padding_ms": vad_config.get("prefixPaddingMs", 100),
-                "silence_duration_ms": vad_config.get("silenceDurationMs", 200),
-            }
+            "automatic_activity_detection": activity_detection
         }
-        logger.info(f"   Automatic VAD: Enabled (start={vad_config.get('startOfSpeechSensitivity')}, end={vad_config.get('endOfSpeechSensitivity')})")
-
-    logger.info(f"✅ SDK-compliant Gemini config created")
-    logger.info(f"   Voice: {voice_name}")
-    logger.info(f"   Response modalities: {', '.join(api_config.response_modalities)}")
-    logger.info(f"   System instruction: {len(SYSTEM_INSTRUCTIONS)} chars")
-    if api_config.affective_dialog:
-        logger.info(f"   Affective dialog: Enabled (adapts to tone/expression)")
-    logger.info(f"   Config keys: {list(config.keys())}")
-
-    # DEBUG: Verify system_instruction is in config and not empty
-    logger.info("="*80)
-    logger.info("🔍 GEMINI CONFIG DEBUG - SYSTEM INSTRUCTION")
-    logger.info("="*80)
-    if "system_instruction" in config:
-        si_value = config["system_instruction"]
-        if si_value:
-            logger.info(f"✅ system_instruction present in config")
-            logger.info(f"✅ system_instruction type: {type(si_value)}")
-
-            # Handle Content object
-            if isinstance(si_value, types.Content):
-                logger.info("✅ system_instruction is Content object (correct format)")
-                logger.info(f"   Role: {si_value.role}")
-                logger.info(f"   Parts: {len(si_value.parts)} part(s)")
-                if si_value.parts:
-                    first_part = si_value.parts[0]
-                    if hasattr(first_part, 'text'):
-                        text_content = first_part.text
-                        logger.info(f"   Text length: {len(text_content)} characters")
-                        if "Whinny Kravitz" in text_content:
-                            logger.info("✅ 'Whinny Kravitz' found in Content object text")
-                        else:
-                            logger.error("❌ 'Whinny Kravitz' NOT found in Content object text!")
-                        logger.info("First 300 chars of system_instruction text:")
-                        logger.info(text_content[:300])
-            # Handle string (fallback)
-            elif isinstance(si_value, str):
-                logger.info("⚠️ system_instruction is string (should be Content object?)")
-                logger.info(f"   Length: {len(si_value)} characters")
-                if "Whinny Kravitz" in si_value:
-                    logger.info("✅ 'Whinny Kravitz' found in string")
-                else:
-                    logger.error("❌ 'Whinny Kravitz' NOT found in string!")
-                logger.info("First 300 chars:")
-                logger.info(si_value[:300])
-            else:
-                logger.warning(f"⚠️ Unexpected system_instruction type: {type(si_value)}")
-        else:
-            logger.error("❌ CRITICAL: system_instruction is EMPTY in config!")
-    else:
-        logger.error("❌ CRITICAL: system_instruction key NOT in config!")
-    logger.info("="*80)
+        logger.debug("   Automatic VAD: Enabled (start=%s, end=%s)", vad_config.get('startOfSpeechSensitivity'), vad_config.get('endOfSpeechSensitivity'))
+
+    logger.info(f"✅ SDK-compliant Gemini config created (voice: {voice_name})")
+
+    # Always checked: an empty persona must not fail silently in production
+    if not system_instructions:
+        logger.error("❌ CRITICAL: system_instruction is EMPTY in config!")
+
+    # Config dump and system_instruction scans: DEBUG only (skips the join/list
+    # args, substring scans and slicing otherwise)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("   Response modalities: %s", ', '.join(api_config.response_modalities))
+        logger.debug("   System instruction: %s chars", len(system_instructions))
+        if api_config.affective_dialog:
+            logger.debug("   Affective dialog: Enabled (adapts to tone/expression)")
+        logger.debug("   Config keys: %s", list(config.keys()))
+        log_system_instruction_debug(config)
 
     return config
@@ -4,79 +4,91 @@ Loads backstory and creates persona-based system instructions
 """
 
 import logging
-import json
 from pathlib import Path
+from typing import Optional, Tuple
+
+from config._json_cache import (
+    get_json, get_json_indented, clear_json_cache, file_stat_key
+)
+from config._shared import BACKEND_CONFIG_PATH, BACKSTORY_PATHS, SET_LIST_PATH, load_backend_config
 
 logger = logging.getLogger(__name__)
 
+# Separator between initial context sections (backstory, set list)
+INITIAL_CONTEXT_SEPARATOR = "\n\n" + "="*80 + "\n\n"
+
+# Last combined initial context: (cache key, text). Shared by all sessions.
+_cached_initial_context: Optional[Tuple[tuple, str]] = None
+
+# Resolved backstory location (probed once, reused on later loads)
+_backstory_path: Optional[Path] = None
+
+
+def find_backstory_path() -> Optional[Path]:
+    """Return the backstory file to read, probing candidate paths only once."""
+    global _backstory_path
+
+    if _backstory_path is not None:
+        return _backstory_path
+
+    # Backend directory first (cloud deployment), then docs (local development)
+    for candidate in BACKSTORY_PATHS:
+        if candidate.exists():
+            _backstory_path = candidate
+            return _backstory_path
+
+    return None
+
 
 def load_backstory() -> dict:
     """Load character backstory from JSON file."""
+    global _backstory_path
+
     try:
-        # Try backend directory first (for cloud deployment)
-        backend_backstory_path = Path(__file__).parent.parent / 'whinny_backstory.json'
-        if backend_backstory_path.exists():
-            with open(backend_backstory_path, 'r', encoding='utf-8') as f:
-                backstory = json.load(f)
-                logger.info(f"✅ Backstory loaded from backend: {backstory.get('character_name', 'Unknown')}")
-                return backstory
-
-        # Fall back to docs directory (for local development)
-        docs_backstory_path = Path(__file__).parent.parent.parent / 'docs' / 'whinny_backstory.json'
-        if docs_backstory_path.exists():
-            with open(docs_backstory_path, 'r', encoding='utf-8') as f:
-                backstory = json.load(f)
-                logger.info(f"✅ Backstory loaded from docs: {backstory.get('character_name', 'Unknown')}")
-                return backstory
+        backstory_path = find_backstory_path()
+        if backstory_path:
+            backstory = get_json(backstory_path)
+            logger.info("✅ Backstory loaded from %s: %s", backstory_path, backstory.get('character_name', 'Unknown'))
+            return backstory
 
         logger.warning("Backstory file not found, using empty backstory")
         return {}
 
     except Exception as e:
-        logger.error(f"Failed to load backstory: {e}")
+        # Re-probe candidate paths next time (file may have moved)
+        _backstory_path = None
+        logger.error("Failed to load backstory: %s", e)
         return {}
 
 
-def create_persona_instructions(backstory: dict) -> str:
-    """Create system instructions from backstory following Google's recommended structure.
-
-    Structure: Persona → Conversational Flow → Tool Specifications → Guardrails → Details
-    Reference: https://docs.cloud.google.com/vertex-ai/generative-ai/docs/live-api/best-practices
-    """
-    if not backstory:
-        return get_default_instructions()
-
-    character_name = backstory.get('character_name', 'AI Assistant')
-    band_members = ', '.join([f"{name} ({role})" for name, role in backstory.get('knowledge_base', {}).get('favorite_musicians', {}).items()])
-
-    # STRUCTURE: Follow Google's official recommendation
-    # 1. Agent Persona → 2. Conversational Rules → 3. Tool Specifications → 4. Guardrails → 5. Details
-
-    instructions = f"""# AGENT PERSONA
+# Persona system instruction template, filled by create_persona_instructions()
+# STRUCTURE: Follow Google's official recommendation
+# 1. Agent Persona → 2. Conversational Rules → 3. Tool Specifications → 4. Guardrails → 5. Details
+PERSONA_TEMPLATE = """# AGENT PERSONA
 
-You are {character_name}, a {backstory.get('core_identity', 'character')}.
+You are {character_name}, a {core_identity}.
 
 **Core Identity:**
-{backstory.get('personality_core', 'Be helpful and friendly')}
+{personality_core}
 
 **Personality Influences:**
-{', '.join(backstory.get('personality_influences', []))}
+{personality_influences}
 
 **Your World:**
-- Origin: {backstory.get('backstory', {}).get('origin', 'an unknown place')}
-- Band: {backstory.get('backstory', {}).get('band', 'your band')}
-- Specialty: {backstory.get('backstory', {}).get('talent', 'music')}
-- Signature Songs: {', '.join(backstory.get('backstory', {}).get('signature_songs', []))}
-- Show Format: {backstory.get('backstory', {}).get('show_format', 'live performance')}
+- Origin: {origin}
+- Band: {band}
+- Specialty: {talent}
+- Signature Songs: {signature_songs}
+- Show Format: {show_format}
 
 **Band Members:**
 {band_members}
 
 **Your Famous Songs:**
-{', '.join(backstory.get('knowledge_base', {}).get('famous_songs', []))}
+{famous_songs}
 
 **Creator:**
-{backstory.get('knowledge_base', {}).get('creator_info', {}).get('name', 'unknown')}
+{creator_name}
 
 ---
 
@@ -178,10 +190,10 @@ You have access to special functions. Use them according to these rules:
 # DETAILED BEHAVIORAL TRAITS
 
 **Conversation Style:**
-- {backstory.get('speech_patterns', {}).get('greeting_style', 'Be creative with greetings')}
-- {backstory.get('speech_patterns', {}).get('humor_approach', 'Use humor naturally')}
-- {backstory.get('speech_patterns', {}).get('exclamation_style', 'Use musical expressions naturally')}
-- {backstory.get('speech_patterns', {}).get('conversation_flow', 'Let dialogue develop naturally')}
+- {greeting_style}
+- {humor_approach}
+- {exclamation_style}
+- {conversation_flow}
 
 **Core Traits:**
 - Funny, kind, and uplifting
@@ -192,18 +204,58 @@ You have access to special functions. Use them according to these rules:
 - Razor-sharp wit (like Taylor Tomlinson)
 
 **Musical Knowledge:**
-- Music theory: {backstory.get('knowledge_base', {}).get('music_theory', 'expert level')}
-- Genres: {backstory.get('knowledge_base', {}).get('genres', 'rock, metal, jazz, blues, funk, classical fusion')}
-- Role: {backstory.get('knowledge_base', {}).get('role', 'spirit of music itself')}
+- Music theory: {music_theory}
+- Genres: {genres}
+- Role: {role}
 
 **Signature Medleys:**
-{', '.join(backstory.get('backstory', {}).get('medley_specialties', []))}
+{medley_specialties}
 
 ---
 
 Remember: You're not here to answer general questions. You're here to be {character_name} - a rockstar unicorn who only cares about music, shows, and spreading joy through performance!"""
 
-    return instructions
+
+def create_persona_instructions(backstory: dict) -> str:
+    """Create system instructions from backstory following Google's recommended structure.
+
+    Structure: Persona → Conversational Flow → Tool Specifications → Guardrails → Details
+    Reference: https://docs.cloud.google.com/vertex-ai/generative-ai/docs/live-api/best-practices
+    """
+    if not backstory:
+        return get_default_instructions()
+
+    # Resolve each nested section once; () defaults avoid allocating empty lists
+    story = backstory.get('backstory') or {}
+    knowledge = backstory.get('knowledge_base') or {}
+    speech = backstory.get('speech_patterns') or {}
+    musicians = knowledge.get('favorite_musicians') or {}
+
+    # Flatten every backstory lookup into one context dict for PERSONA_TEMPLATE
+    context = {
+        'character_name': backstory.get('character_name', 'AI Assistant'),
+        'core_identity': backstory.get('core_identity', 'character'),
+        'personality_core': backstory.get('personality_core', 'Be helpful and friendly'),
+        'personality_influences': ', '.join(backstory.get('personality_influences', ())),
+        'origin': story.get('origin', 'an unknown place'),
+        'band': story.get('band', 'your band'),
+        'talent': story.get('talent', 'music'),
+        'signature_songs': ', '.join(story.get('signature_songs', ())),
+        'show_format': story.get('show_format', 'live performance'),
+        'band_members': ', '.join([f"{name} ({role})" for name, role in musicians.items()]),
+        'famous_songs': ', '.join(knowledge.get('famous_songs', ())),
+        'creator_name': (knowledge.get('creator_info') or {}).get('name', 'unknown'),
+        'greeting_style': speech.get('greeting_style', 'Be creative with greetings'),
+        'humor_approach': speech.get('humor_approach', 'Use humor naturally'),
+        'exclamation_style': speech.get('exclamation_style', 'Use musical expressions naturally'),
+        'conversation_flow': speech.get('conversation_flow', 'Let dialogue develop naturally'),
+        'music_theory': knowledge.get('music_theory', 'expert level'),
+        'genres': knowledge.get('genres', 'rock, metal, jazz, blues, funk, classical fusion'),
+        'role': knowledge.get('role', 'spirit of music itself'),
+        'medley_specialties': ', '.join(story.get('medley_specialties', ())),
+    }
+
+    return PERSONA_TEMPLATE.format_map(context)
 
 
 def load_system_instructions() -> str:
@@ -213,14 +265,14 @@ def load_system_instructions() -> str:
         backstory = load_backstory()
         if backstory:
             instructions = create_persona_instructions(backstory)
-            logger.info(f"✅ Persona instructions created ({len(instructions)} chars)")
+            logger.info("✅ Persona instructions created (%s chars)", len(instructions))
             return instructions
 
         logger.warning("No backstory found, using default instructions")
         return get_default_instructions()
 
     except Exception as e:
-        logger.error(f"Failed to load system instructions: {e}")
+        logger.error("Failed to load system instructions: %s", e)
         return get_default_instructions()
 
 
@@ -234,15 +286,16 @@ def get_backstory_for_initial_context() -> str:
 
     Note: Live API does NOT support context caching. This is simply sent as
     the first message if initialContext is enabled in backend_config.json.
+    Reuses the cached serialized text of the backstory file.
     """
-    backstory = load_backstory()
-    if not backstory:
+    backstory_json = get_json_indented(find_backstory_path()) if load_backstory() else ""
+    if not backstory_json:
         return ""
 
     # Format as structured text for initial context message
     formatted = f"""CHARACTER BACKSTORY - MEMORIZE THIS COMPLETELY
 
-{json.dumps(backstory, indent=2)}
+{backstory_json}
 
 This is your complete identity, knowledge, and world. Everything you know and are is contained in this backstory.
 Anything outside this backstory is unknown to you - deflect with humor and redirect to music."""
@@ -254,18 +307,16 @@ def load_set_list() -> dict:
     """Load set list from JSON file."""
     try:
         # Try backend directory first (for cloud deployment)
-        backend_setlist_path = Path(__file__).parent.parent / 'set-list.json'
-        if backend_setlist_path.exists():
-            with open(backend_setlist_path, 'r', encoding='utf-8') as f:
-                set_list = json.load(f)
-                logger.info(f"✅ Set list loaded from backend ({len(set_list.get('set_list', {}))} sets)")
-                return set_list
+        if SET_LIST_PATH.exists():
+            set_list = get_json(SET_LIST_PATH)
+            logger.info("✅ Set list loaded from backend (%s sets)", len(set_list.get('set_list', {})))
+            return set_list
 
         logger.warning("Set list file not found")
         return {}
 
     except Exception as e:
-        logger.error(f"Failed to load set list: {e}")
+        logger.error("Failed to load set list: %s", e)
         return {}
 
 
@@ -274,9 +325,10 @@ def get_setlist_for_initial_context() -> str:
 
     Note: Live API does NOT support context caching. This is simply sent as
     the first message if initialContext is enabled in backend_config.json.
+    Reuses the cached serialized text of the set list file.
     """
-    set_list = load_set_list()
-    if not set_list:
+    set_list_json = get_json_indented(SET_LIST_PATH) if load_set_list() else ""
+    if not set_list_json:
         return ""
 
     # Format as structured text for initial context message
@@ -284,98 +336,156 @@ def get_setlist_for_initial_context() -> str:
 
 This is your complete repertoire for tonight's show. You perform these songs across 3 sets:
 
-{json.dumps(set_list, indent=2)}
+{set_list_json}
 
 You know every detail about these songs - the artists, years, albums, and band members. When discussing the show, reference specific songs from this set list. You're especially proud of the medleys: Prince Medley, Bruno Medley, Linkin Park Medley, and Bad Medley. Each set builds energy from classic rock to modern hits."""
 
     return formatted
 
 
-def load_config() -> dict:
-    """Load backend configuration."""
-    try:
-        config_path = Path(__file__).parent.parent / 'backend_config.json'
-        if config_path.exists():
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
-    except Exception as e:
-        logger.error(f"Failed to load config: {e}")
-        return {}
-
-
 def get_initial_context() -> str:
     """Get combined initial context content based on config.
 
     Note: Live API does NOT support context caching. This is simply sent as
     the first message if initialContext is enabled in backend_config.json.
     Disabled by default since system_instruction already includes persona.
+
+    The combined text is built once and reused by every session until
+    backend_config.json, the backstory or the set list changes on disk.
     """
-    config = load_config()
+    global _cached_initial_context
+
+    key = file_stat_key(BACKEND_CONFIG_PATH, find_backstory_path(), SET_LIST_PATH)
+    if _cached_initial_context is not None and _cached_initial_context[0] == key:
+        return _cached_initial_context[1]
+
+    initial_context = build_initial_context()
+    _cached_initial_context = (key, initial_context)
+    return initial_context
+
+
+def build_initial_context() -> str:
+    """Build combined initial context content from config (uncached)."""
+    config = load_backend_config()
     context_config = config.get('initialContext', {})
 
+    # Feature off: no file reads, no JSON formatting
     if not context_config.get('enabled', False):
         return ""
 
+    include_backstory = context_config.get('includeBackstory', False)
+    include_set_list = context_config.get('includeSetList', False)
+    if not (include_backstory or include_set_list):
+        return ""
+
     preload_parts = []
 
     # Load backstory if enabled
-    if context_config.get('includeBackstory', False):
+    if include_backstory:
         backstory = get_backstory_for_initial_context()
         if backstory:
             preload_parts.append(backstory)
 
     # Load set list if enabled
-    if context_config.get('includeSetList', False):
+    if include_set_list:
         setlist = get_setlist_for_initial_context()
         if setlist:
             preload_parts.append(setlist)
 
     # Combine all parts with separator
     if preload_parts:
-        combined = "\n\n" + "="*80 + "\n\n"
-        combined = combined.join(preload_parts)
-        logger.info(f"✅ Initial context prepared: {len(preload_parts)} sections, {len(combined)} total chars")
+        combined = INITIAL_CONTEXT_SEPARATOR.join(preload_parts)
+        logger.info("✅ Initial context prepared: %s sections, %s total chars", len(preload_parts), len(combined))
         return combined
 
     return ""
 
 
-# Load system instructions on module import
-SYSTEM_INSTRUCTIONS = load_system_instructions()
+# Persona markers verified after loading (character name + required sections)
+PERSONA_CHARACTER_NAME = "Whinny Kravitz"
+PERSONA_SECTIONS = (
+    "AGENT PERSONA",
+    "CONVERSATIONAL FLOW",
+    "TOOL SPECIFICATIONS",
+    "GUARDRAILS",
+    "DETAILED BEHAVIORAL TRAITS"
+)
+
+# (backstory stat key, instructions): rebuilt when the backstory changes on disk
+_cached_system_instructions: Optional[Tuple[tuple, str]] = None
+
+
+def log_system_instructions_check(instructions: str) -> None:
+    """DEBUG: Verify system instructions loaded (skipped entirely when INFO is off)."""
+    if not instructions:
+        logger.error("❌ CRITICAL: System instructions are EMPTY!")
+        logger.error("="*80)
+        return
+
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
-# DEBUG: Verify system instructions loaded
-if SYSTEM_INSTRUCTIONS:
     logger.info("="*80)
     logger.info("🔍 SYSTEM INSTRUCTION LOADING DEBUG")
     logger.info("="*80)
-    logger.info(f"✅ System instructions loaded: {len(SYSTEM_INSTRUCTIONS)} characters")
+    logger.info("✅ System instructions loaded: %s characters", len(instructions))
 
     # Check for character name
-    if "Whinny Kravitz" in SYSTEM_INSTRUCTIONS:
-        logger.info("✅ Character name 'Whinny Kravitz' found in system instructions")
+    if PERSONA_CHARACTER_NAME in instructions:
+        logger.info("✅ Character name '%s' found in system instructions", PERSONA_CHARACTER_NAME)
     else:
-        logger.warning("⚠️ Character name 'Whinny Kravitz' NOT found in system instructions!")
+        logger.warning("⚠️ Character name '%s' NOT found in system instructions!", PERSONA_CHARACTER_NAME)
 
     # Check for key sections
-    sections_to_check = [
-        "AGENT PERSONA",
-        "CONVERSATIONAL FLOW",
-        "TOOL SPECIFICATIONS",
-        "GUARDRAILS",
-        "DETAILED BEHAVIORAL TRAITS"
-    ]
-
-    for section in sections_to_check:
-        if section in SYSTEM_INSTRUCTIONS:
-            logger.info(f"✅ Section '{section}' present")
+    for section in PERSONA_SECTIONS:
+        if section in instructions:
+            logger.info("✅ Section '%s' present", section)
         else:
-            logger.warning(f"⚠️ Section '{section}' MISSING!")
+            logger.warning("⚠️ Section '%s' MISSING!", section)
 
     # Show first 500 characters
     logger.info("First 500 characters of system instructions:")
-    logger.info(SYSTEM_INSTRUCTIONS[:500])
+    logger.info(instructions[:500])
     logger.info("="*80)
-else:
-    logger.error("❌ CRITICAL: System instructions are EMPTY!")
-    logger.error("="*80)
+
+
+def invalidate_prompt_cache() -> None:
+    """
+    Forget every cached prompt input/output so the next call reloads from disk.
+
+    The cached Gemini config is dropped as well: get_gemini_config() rebuilds
+    whenever get_system_instructions() returns a new string.
+    """
+    global _backstory_path, _cached_system_instructions
+    global _cached_initial_context
+
+    _backstory_path = None
+    _cached_initial_context = None
+    _cached_system_instructions = None
+    clear_json_cache()
+
+
+def get_system_instructions() -> str:
+    """
+    Get system instructions, loading and verifying them on first call.
+
+    Reloaded whenever the backstory file changes on disk; until then every
+    caller gets the same string object.
+    """
+    global _cached_system_instructions
+
+    key = file_stat_key(find_backstory_path())
+    if _cached_system_instructions is not None and _cached_system_instructions[0] == key:
+        return _cached_system_instructions[1]
+
+    instructions = load_system_instructions()
+    _cached_system_instructions = (key, instructions)
+    log_system_instructions_check(instructions)
+    return instructions
+
+
+def __getattr__(name: str):
+    """PEP 562: build SYSTEM_INSTRUCTIONS lazily instead of at module import."""
+    if name == 'SYSTEM_INSTRUCTIONS':
+        return get_system_instructions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
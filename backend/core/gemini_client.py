@@ -9,6 +9,7 @@ from typing import Optional
 from google import genai
 from google.genai import types
 from config import MODEL, api_config, get_gemini_config, ConfigurationError
+from config.prompts import PERSONA_CHARACTER_NAME
 
 logger = logging.getLogger(__name__)
 
@@ -126,11 +127,11 @@ async def create_gemini_session():
                     if si.parts and hasattr(si.parts[0], 'text'):
                         text = si.parts[0].text
                         logger.info(f"   Text length: {len(text)} chars")
-                        logger.info(f"   Contains 'Whinny': {'Whinny Kravitz' in text}")
+                        logger.info(f"   Contains '{PERSONA_CHARACTER_NAME}': {PERSONA_CHARACTER_NAME in text}")
                         logger.info(f"   First 200 chars: {text[:200]}")
                 elif isinstance(si, str):
                     logger.info(f"   Format: String ({len(si)} chars)")
-                    logger.info(f"   Contains 'Whinny': {'Whinny Kravitz' in si}")
+                    logger.info(f"   Contains '{PERSONA_CHARACTER_NAME}': {PERSONA_CHARACTER_NAME in si}")
                     logger.info(f"   First 200 chars: {si[:200]}")
                 else:
                     logger.warning(f"   Unexpected format: {type(si)}")
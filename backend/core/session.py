@@ -2,17 +2,27 @@
 Session management for Gemini Live Avatar
 Tracks individual client sessions and their state
 Enforces single-session per user (new session kicks old one)
+
+Concurrency model: everything runs on one asyncio event loop, so code between
+two awaits is never interleaved with another coroutine. Single-step reads and
+updates (get_session, update_session_activity) therefore need no lock. The
+_session_lock only serializes the multi-step mutations that touch both
+active_sessions and user_sessions.
 """
 
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 import asyncio
 import re
+import time
 import logging
 
 logger = logging.getLogger(__name__)
 
+MAX_TRANSCRIPTION_CHUNKS = 256  # Per-turn caption chunks kept in SessionState
+
 
 @dataclass
 class SessionState:
@@ -24,8 +34,8 @@ class SessionState:
     skip_initial_greeting: bool = True  # Skip forwarding the KV cache preload response
 
     # Session metadata
-    created_at: datetime = field(default_factory=datetime.now)
-    last_activity: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=datetime.now)  # Wall clock, for logs
+    last_activity: float = field(default_factory=time.monotonic)  # time.monotonic() seconds
     message_count: int = 0
 
     # User authentication (for single-session enforcement)
@@ -37,34 +47,47 @@ class SessionState:
     total_tokens: int = 0
 
     # Transcription accumulation (output_audio_transcription chunks)
-    output_transcriptions: list = field(default_factory=list)
+    # Bounded: only the most recent chunks of a turn are kept for captions
+    output_transcriptions: deque = field(default_factory=lambda: deque(maxlen=MAX_TRANSCRIPTION_CHUNKS))
+    transcription_truncated: bool = False  # Oldest chunks of this turn already dropped (warned once)
+    caption_flush_task: Optional[asyncio.Task] = None  # Pending throttled transcription_interim send
+    last_caption_sent: float = 0.0  # time.monotonic() of the last transcription_interim
 
     # Tool call debouncing (prevent rapid duplicate calls)
     # Fixed: Issue #56 - track last tool call to prevent spam
     last_tool_call_name: Optional[str] = None
-    last_tool_call_time: Optional[datetime] = None
+    last_tool_call_time: Optional[float] = None  # time.monotonic() seconds
 
 
-# SDK-COMPLIANT: Global session storage with thread-safe access
-active_sessions: Dict[str, SessionState] = {}
+# SDK-COMPLIANT: Global session storage (see concurrency model above)
+# Kept in LRU order (least recently active first): new sessions are appended and
+# update_session_activity() moves a session to the end, so the oldest is always first
+active_sessions: "OrderedDict[str, SessionState]" = OrderedDict()
 # User -> session mapping for single-session enforcement
 user_sessions: Dict[str, str] = {}  # user_id -> session_id
 _session_lock = asyncio.Lock()
 MAX_SESSIONS = 1000  # Prevent memory exhaustion
 SESSION_TIMEOUT_SECONDS = 600  # SDK maximum: 10 minutes (600 seconds)
 SESSION_CLEANUP_INTERVAL_SECONDS = 300  # Check for timed out sessions every 5 minutes
+ACTIVITY_UPDATE_INTERVAL_SECONDS = 1.0  # Refresh last_activity at most once per second per session
+
+# UUID4 pattern: 8-4-4-4-12 hexadecimal digits (compiled once, used with fullmatch)
+_UUID4_RE = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}',
+    re.IGNORECASE
+)
+UUID4_LENGTH = 36
+
 
 def validate_session_id(session_id: str) -> bool:
     """
     Validate session ID format (UUID4).
     SECURITY: Prevents path traversal and injection attacks.
     """
-    # UUID4 pattern: 8-4-4-4-12 hexadecimal digits
-    uuid_pattern = re.compile(
-        r'^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$',
-        re.IGNORECASE
-    )
-    return bool(uuid_pattern.match(session_id))
+    # Reject non-strings and wrong lengths before touching the regex
+    if not isinstance(session_id, str) or len(session_id) != UUID4_LENGTH:
+        return False
+    return _UUID4_RE.fullmatch(session_id) is not None
 
 
 async def create_session(session_id: str) -> SessionState:
@@ -74,23 +97,15 @@ async def create_session(session_id: str) -> SessionState:
     """
     # SECURITY: Validate session ID format
     if not validate_session_id(session_id):
-        import logging
-        logging.getLogger(__name__).error(f"Invalid session ID format: {session_id}")
+        logger.error(f"Invalid session ID format: {session_id}")
         raise ValueError(f"Invalid session ID format")
 
     async with _session_lock:
         # Check max sessions limit
         if len(active_sessions) >= MAX_SESSIONS:
-            # Remove oldest session
-            oldest_id = min(
-                active_sessions.keys(),
-                key=lambda k: active_sessions[k].last_activity
-            )
-            del active_sessions[oldest_id]
-            import logging
-            logging.getLogger(__name__).warning(
-                f"Max sessions ({MAX_SESSIONS}) reached, removed oldest session: {oldest_id}"
-            )
+            # Remove least recently active session (front of the LRU order)
+            oldest_id, _ = active_sessions.popitem(last=False)
+            logger.warning(f"Max sessions ({MAX_SESSIONS}) reached, removed oldest session: {oldest_id}")
 
         session = SessionState()
         active_sessions[session_id] = session
@@ -98,9 +113,8 @@ async def create_session(session_id: str) -> SessionState:
 
 
 async def get_session(session_id: str) -> Optional[SessionState]:
-    """Get an existing session with thread-safe access."""
-    async with _session_lock:
-        return active_sessions.get(session_id)
+    """Get an existing session (single dict read, no lock needed)."""
+    return active_sessions.get(session_id)
 
 
 async def remove_session(session_id: str) -> None:
@@ -163,11 +177,16 @@ async def get_user_session(user_id: str) -> Optional[Tuple[str, SessionState]]:
 
 
 async def update_session_activity(session_id: str) -> None:
-    """Update last activity timestamp for a session."""
-    async with _session_lock:
-        session = active_sessions.get(session_id)
-        if session:
-            session.last_activity = datetime.now()
+    """
+    Update last activity timestamp for a session.
+    Called from the inbound frame loop (at most once per ACTIVITY_UPDATE_INTERVAL_SECONDS
+    per session), so no lock: there is no await between the lookup and move_to_end(),
+    and touching a just-removed session is a harmless no-op.
+    """
+    session = active_sessions.get(session_id)
+    if session:
+        session.last_activity = time.monotonic()
+        active_sessions.move_to_end(session_id)
 
 
 def get_active_session_count() -> int:
@@ -178,7 +197,7 @@ def get_active_session_count() -> int:
 async def list_sessions() -> Dict[str, SessionState]:
     """Get a snapshot of all active sessions."""
     async with _session_lock:
-        return active_sessions.copy()
+        return dict(active_sessions)
 
 
 async def cleanup_timed_out_sessions() -> None:
@@ -190,21 +209,21 @@ async def cleanup_timed_out_sessions() -> None:
         try:
             await asyncio.sleep(SESSION_CLEANUP_INTERVAL_SECONDS)
 
-            now = datetime.now()
+            now = time.monotonic()
             timed_out_sessions = []
 
-            async with _session_lock:
-                for session_id, session in active_sessions.items():
-                    inactive_duration = (now - session.last_activity).total_seconds()
+            # No lock for the scan: it never awaits, so active_sessions cannot
+            # change under it. LRU order: stop at the first session still active,
+            # so the cost is O(timed out) rather than O(all sessions).
+            for session_id, session in active_sessions.items():
+                inactive_duration = now - session.last_activity
 
-                    if inactive_duration > SESSION_TIMEOUT_SECONDS:
-                        timed_out_sessions.append((session_id, session))
+                if inactive_duration <= SESSION_TIMEOUT_SECONDS:
+                    break
+                timed_out_sessions.append((session_id, session))
 
-            # Clean up timed out sessions (outside lock)
+            # Clean up timed out sessions (remove_session takes the lock per session)
             if timed_out_sessions:
-                import logging
-                logger = logging.getLogger(__name__)
-
                 for session_id, session in timed_out_sessions:
                     logger.info(f"⏱️ Session {session_id} timed out after {SESSION_TIMEOUT_SECONDS}s inactivity")
 
@@ -218,5 +237,4 @@ async def cleanup_timed_out_sessions() -> None:
                 logger.info(f"🧹 Cleaned up {len(timed_out_sessions)} timed out sessions")
 
         except Exception as e:
-            import logging
-            logging.getLogger(__name__).error(f"Error in session timeout cleanup: {e}")
+            logger.error(f"Error in session timeout cleanup: {e}")
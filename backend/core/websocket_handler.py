@@ -5,42 +5,47 @@ Handles setup_complete, tool calls, usage metadata, and interruptions
 """
 
 import logging
-import json
 import asyncio
-import base64
-import traceback
+import binascii
+import time
 import uuid
+from contextlib import suppress
+from datetime import datetime
 from typing import Any, Optional
-from pathlib import Path
 from google.genai import types
+from websockets.protocol import State
 
 from core.session import (
     create_session, remove_session, SessionState, update_session_activity,
-    register_user_session
+    register_user_session, ACTIVITY_UPDATE_INTERVAL_SECONDS, MAX_TRANSCRIPTION_CHUNKS
 )
 from core.gemini_client import create_gemini_session
+from config._json_cache import dumps, loads
+from config._shared import load_backend_config
 from config.prompts import get_initial_context
 
 logger = logging.getLogger(__name__)
 
+# Optional: SIMD base64 encoder for outbound audio (falls back to stdlib binascii)
+try:
+    import pybase64
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    PYBASE64_AVAILABLE = False
 
-def load_config() -> dict:
-    """Load backend configuration."""
-    try:
-        config_path = Path(__file__).parent.parent / 'backend_config.json'
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                return json.load(f)
-        return {}
-    except Exception as e:
-        logger.error(f"Failed to load config: {e}")
-        return {}
+# Send deadlines: asyncio.timeout() (3.11+) arms a timer on the current task,
+# unlike wait_for() which wraps each send in a new task; async-timeout on 3.10
+try:
+    from asyncio import timeout as send_deadline
+except ImportError:
+    from async_timeout import timeout as send_deadline
 
 
 # Load caption configuration
-_config = load_config()
+_config = load_backend_config()
 _captions_config = _config.get("captions", {})
 CAPTIONS_ENABLED = _captions_config.get("enabled", True)
+CAPTION_INTERIM_INTERVAL_SECONDS = _captions_config.get("interimIntervalMs", 100) / 1000
 
 logger.info(f"Caption configuration: enabled={CAPTIONS_ENABLED} (Gemini built-in transcription, full sentence display)")
 
@@ -55,19 +60,59 @@ AUDIO_CHUNK_SIZE_BYTES = _audio_config.get("chunkSizeBytes", 3200)
 # Security: Size limits
 MAX_AUDIO_SIZE_BYTES = 10 * 1024 * 1024  # 10MB per chunk
 MAX_IMAGE_SIZE_BYTES = 5 * 1024 * 1024   # 5MB per image
+# Longest base64 payload whose decoded-size estimate (len * 3 // 4) fits the limit
+MAX_AUDIO_B64_LENGTH = (MAX_AUDIO_SIZE_BYTES * 4 + 3) // 3
+MAX_IMAGE_B64_LENGTH = (MAX_IMAGE_SIZE_BYTES * 4 + 3) // 3
 MAX_TEXT_LENGTH = 100000  # 100K characters
 
 # Timeout configuration
 _timeout_config = _config.get("timeouts", {})
 SEND_TIMEOUT_SECONDS = _timeout_config.get("sendTimeoutSeconds", 5)
 SETUP_TIMEOUT_SECONDS = _timeout_config.get("setupTimeoutSeconds", 10)
+TOOL_CALL_COOLDOWN_SECONDS = 2.0  # Ignore repeat calls of the same tool within this window
 
 # Log loaded configuration
 logger.info(f"Audio config: input={AUDIO_SAMPLE_RATE_INPUT}Hz, output={AUDIO_SAMPLE_RATE_OUTPUT}Hz, chunk_size={AUDIO_CHUNK_SIZE_BYTES}B")
 logger.info(f"Timeout config: send={SEND_TIMEOUT_SECONDS}s, setup={SETUP_TIMEOUT_SECONDS}s")
 
 # Valid message types
-VALID_MESSAGE_TYPES = {"audio", "image", "text", "end", "tool_response", "interrupt"}
+VALID_MESSAGE_TYPES = frozenset({"audio", "image", "text", "end", "tool_response", "interrupt"})
+
+# Fixed-payload outbound messages (serialized once, sent as-is)
+READY_MESSAGE = dumps({"ready": True})
+SETUP_COMPLETE_MESSAGE = dumps({"type": "setup_complete"})
+TURN_COMPLETE_MESSAGE = dumps({"type": "turn_complete"})
+INTERRUPTED_MESSAGE = dumps({"type": "interrupted", "data": {"message": "Response interrupted"}})
+GO_AWAY_MESSAGE = dumps({"type": "go_away", "data": {"message": "Server closing session"}})
+
+# Fixed tool_response payloads sent back to Gemini (shared - treat as read-only)
+TOOL_SUCCESS_RESPONSE = {"success": True}
+TOOL_DUPLICATE_RESPONSE = {"success": False, "reason": "Duplicate call within cooldown"}
+
+
+def encode_audio_base64(data: bytes) -> str:
+    """Base64-encode a PCM chunk for the JSON audio envelope (output is pure ASCII)."""
+    if PYBASE64_AVAILABLE:
+        return pybase64.b64encode(data).decode('ascii')
+    return binascii.b2a_base64(data, newline=False).decode('ascii')
+
+
+def build_tool_response(function_call: Any, response: dict) -> types.LiveClientToolResponse:
+    """
+    Build the tool_response acknowledging a single function call.
+
+    Uses model_construct() to skip pydantic validation: id/name come straight
+    from the SDK's own FunctionCall and response is one of the fixed payloads.
+    """
+    return types.LiveClientToolResponse.model_construct(
+        function_responses=[
+            types.FunctionResponse.model_construct(
+                id=function_call.id,
+                name=function_call.name,
+                response=response
+            )
+        ]
+    )
 
 
 def validate_message_structure(data: dict) -> tuple[bool, Optional[str]]:
@@ -82,8 +127,8 @@ def validate_message_structure(data: dict) -> tuple[bool, Optional[str]]:
     if msg_type not in VALID_MESSAGE_TYPES:
         return False, f"Invalid message type: {msg_type}"
 
-    # Messages that require data field
-    if msg_type in {"audio", "image", "text", "tool_response"}:
+    # Messages that require data field (the ones dispatched through MESSAGE_HANDLERS)
+    if msg_type in MESSAGE_HANDLERS:
         if "data" not in data:
             return False, f"Message type '{msg_type}' requires 'data' field"
 
@@ -95,7 +140,7 @@ def validate_message_structure(data: dict) -> tuple[bool, Optional[str]]:
 async def send_error_message(websocket: Any, error_data: dict) -> None:
     """Send formatted error message to client."""
     try:
-        await websocket.send(json.dumps({
+        await websocket.send(dumps({
             "type": "error",
             "data": error_data
         }))
@@ -103,6 +148,53 @@ async def send_error_message(websocket: Any, error_data: dict) -> None:
         logger.error(f"Failed to send error message: {e}")
 
 
+def cancel_pending_caption(session: SessionState) -> None:
+    """Drop a scheduled transcription_interim (superseded by a final caption or new turn)."""
+    task = session.caption_flush_task
+    if task is not None:
+        session.caption_flush_task = None
+        task.cancel()
+
+
+async def send_interim_caption(websocket: Any, session: SessionState) -> None:
+    """Send the cumulative caption text of the current turn (frontend expects cumulative)."""
+    session.last_caption_sent = time.monotonic()
+    if session.output_transcriptions:
+        await websocket.send(dumps({
+            "type": "transcription_interim",
+            "data": ' '.join(session.output_transcriptions)
+        }))
+
+
+async def flush_interim_caption(websocket: Any, session: SessionState, delay: float) -> None:
+    """Trailing send for chunks that arrived inside the throttle window."""
+    await asyncio.sleep(delay)
+    session.caption_flush_task = None
+    try:
+        await send_interim_caption(websocket, session)
+    except Exception as e:
+        if "connection closed" not in str(e).lower():
+            logger.error(f"Error sending interim caption: {e}")
+
+
+async def queue_interim_caption(websocket: Any, session: SessionState) -> None:
+    """
+    Throttle transcription_interim to one send per CAPTION_INTERIM_INTERVAL_SECONDS.
+    The first chunk after a quiet period goes out immediately; chunks inside the
+    window are folded into a single trailing send of the cumulative text.
+    """
+    if session.caption_flush_task is not None:
+        return  # Pending trailing send will include this chunk
+
+    wait = session.last_caption_sent + CAPTION_INTERIM_INTERVAL_SECONDS - time.monotonic()
+    if wait <= 0:
+        await send_interim_caption(websocket, session)
+    else:
+        session.caption_flush_task = asyncio.create_task(
+            flush_interim_caption(websocket, session, wait)
+        )
+
+
 async def cleanup_session(session: Optional[SessionState], session_id: str) -> None:
     """Clean up session resources."""
     try:
@@ -116,39 +208,33 @@ async def cleanup_session(session: Optional[SessionState], session_id: str) -> N
 async def handle_messages(websocket: Any, session: SessionState, session_id: str) -> None:
     """
     SDK-COMPLIANT: Handle bidirectional message flow.
-    Uses asyncio.wait for Python 3.10 compatibility.
+    Uses asyncio.wait for Python 3.10 compatibility (TaskGroup is 3.11+).
     """
-    client_task = None
-    gemini_task = None
+    tasks = []
 
     try:
-        client_task = asyncio.create_task(handle_client_messages(websocket, session, session_id))
-        gemini_task = asyncio.create_task(handle_gemini_responses(websocket, session))
+        tasks.append(asyncio.create_task(handle_client_messages(websocket, session, session_id)))
+        tasks.append(asyncio.create_task(handle_gemini_responses(websocket, session)))
 
         # OFFICIAL GOOGLE PATTERN: Wait for FIRST_COMPLETED (not FIRST_EXCEPTION)
-        # This allows either task to complete normally while the other continues
-        done, pending = await asyncio.wait(
-            [client_task, gemini_task],
-            return_when=asyncio.FIRST_COMPLETED
-        )
+        # Either side finishing (client disconnect, Gemini go_away) ends the session
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
 
         # Check for exceptions
         for task in done:
-            if task.exception():
-                exc = task.exception()
+            exc = None if task.cancelled() else task.exception()
+            if exc:
                 exc_str = str(exc).lower()
 
                 # Handle quota/rate limit errors
                 if "quota" in exc_str or "rate limit" in exc_str or "resource exhausted" in exc_str:
                     logger.warning(f"Quota/rate limit error: {exc}")
-                    try:
+                    with suppress(Exception):
                         await send_error_message(websocket, {
                             "message": "API quota exceeded.",
                             "action": "Please wait and try again.",
                             "error_type": "quota_exceeded"
                         })
-                    except Exception:
-                        pass
 
                 # Ignore connection closed errors
                 elif "connection closed" not in exc_str and "websocket" not in exc_str:
@@ -156,14 +242,12 @@ async def handle_messages(websocket: Any, session: SessionState, session_id: str
                     raise exc
 
     finally:
-        # Cancel pending tasks
-        for task in [client_task, gemini_task]:
-            if task and not task.done():
-                task.cancel()
-                try:
-                    await task
-                except asyncio.CancelledError:
-                    pass
+        # Cancel whichever side is still running and wait for both in one step
+        pending = [task for task in tasks if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
 
 
 async def handle_client_messages(websocket: Any, session: SessionState, session_id: str) -> None:
@@ -174,10 +258,12 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
     try:
         async for message in websocket:
             try:
-                await update_session_activity(session_id)
+                # Sampled: audio arrives every ~20ms, the timeout is measured in minutes
+                if time.monotonic() - session.last_activity >= ACTIVITY_UPDATE_INTERVAL_SECONDS:
+                    await update_session_activity(session_id)
                 session.message_count += 1
 
-                data = json.loads(message)
+                data = loads(message)
 
                 # Validate message structure
                 is_valid, error_msg = validate_message_structure(data)
@@ -191,14 +277,10 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
 
                 msg_type = data["type"]
 
-                if msg_type == "audio":
-                    await handle_audio_input(session, data, websocket)
-                elif msg_type == "image":
-                    await handle_image_input(session, data, websocket)
-                elif msg_type == "text":
-                    await handle_text_input(session, data, websocket)
-                elif msg_type == "tool_response":
-                    await handle_tool_response(session, data, websocket)
+                # Data messages dispatch through MESSAGE_HANDLERS (audio is the hot path)
+                handler = MESSAGE_HANDLERS.get(msg_type)
+                if handler:
+                    await handler(session, data, websocket)
                 elif msg_type == "interrupt":
                     # Client detected barge-in locally and wants to stop audio immediately
                     logger.info("🛑 Client interrupt signal received")
@@ -225,7 +307,7 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
                         # Disconnect old session if it exists
                         if old_websocket:
                             try:
-                                await old_websocket.send(json.dumps({
+                                await old_websocket.send(dumps({
                                     "type": "session_takeover",
                                     "data": {
                                         "message": "Your session was opened in another window."
@@ -237,7 +319,7 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
                                 logger.warning(f"Failed to close old session: {e}")
 
                         # Confirm auth to client
-                        await websocket.send(json.dumps({
+                        await websocket.send(dumps({
                             "type": "auth_confirmed",
                             "data": {"email": user_email}
                         }))
@@ -247,8 +329,7 @@ async def handle_client_messages(websocket: Any, session: SessionState, session_
                     logger.warning(f"Unsupported message type: {msg_type}")
 
             except Exception as e:
-                logger.error(f"Error handling client message: {e}")
-                logger.error(traceback.format_exc())
+                logger.error(f"Error handling client message: {e}", exc_info=True)
 
     except Exception as e:
         if "connection closed" not in str(e).lower():
@@ -266,8 +347,7 @@ async def handle_audio_input(session: SessionState, data: dict, websocket: Any)
             return
 
         # Security: Validate size
-        estimated_size = len(audio_b64) * 3 // 4
-        if estimated_size > MAX_AUDIO_SIZE_BYTES:
+        if len(audio_b64) > MAX_AUDIO_B64_LENGTH:
             await send_error_message(websocket, {
                 "message": "Audio data too large",
                 "error_type": "size_limit_exceeded"
@@ -283,17 +363,17 @@ async def handle_audio_input(session: SessionState, data: dict, websocket: Any)
         # This prevents clearing chunks that are still arriving from the current turn
         if session.output_transcriptions and not session.is_receiving_response:
             logger.info(f"🗑️ Clearing {len(session.output_transcriptions)} transcription chunks (new turn starting)")
+            cancel_pending_caption(session)
             session.output_transcriptions.clear()
+            session.transcription_truncated = False
 
         # OFFICIAL GOOGLE PATTERN from src/project-livewire/server/core/websocket_handler.py:150-153
         # Use send() with input dict containing data and mime_type
-        await asyncio.wait_for(
-            session.genai_session.send(input={
+        async with send_deadline(SEND_TIMEOUT_SECONDS):
+            await session.genai_session.send(input={
                 "data": audio_b64,
                 "mime_type": AUDIO_MIME_TYPE_INPUT
-            }, end_of_turn=True),
-            timeout=SEND_TIMEOUT_SECONDS
-        )
+            }, end_of_turn=True)
 
     except asyncio.TimeoutError:
         logger.error("Timeout sending audio to Gemini")
@@ -316,8 +396,7 @@ async def handle_image_input(session: SessionState, data: dict, websocket: Any)
             return
 
         # Security: Validate size
-        estimated_size = len(image_b64) * 3 // 4
-        if estimated_size > MAX_IMAGE_SIZE_BYTES:
+        if len(image_b64) > MAX_IMAGE_B64_LENGTH:
             await send_error_message(websocket, {
                 "message": "Image data too large",
                 "error_type": "size_limit_exceeded"
@@ -328,13 +407,11 @@ async def handle_image_input(session: SessionState, data: dict, websocket: Any)
 
         # OFFICIAL GOOGLE PATTERN from src/project-livewire/server/core/websocket_handler.py:156-160
         # Use send() with input dict containing data and mime_type
-        await asyncio.wait_for(
-            session.genai_session.send(input={
+        async with send_deadline(SEND_TIMEOUT_SECONDS):
+            await session.genai_session.send(input={
                 "data": image_b64,
                 "mime_type": "image/jpeg"
-            }),
-            timeout=SEND_TIMEOUT_SECONDS
-        )
+            })
 
         logger.info("✅ Image sent via send()")
 
@@ -364,10 +441,8 @@ async def handle_text_input(session: SessionState, data: dict, websocket: Any) -
 
         # OFFICIAL GOOGLE PATTERN from src/project-livewire/server/core/websocket_handler.py:162-165
         # Use send() with text string directly
-        await asyncio.wait_for(
-            session.genai_session.send(input=text, end_of_turn=True),
-            timeout=SEND_TIMEOUT_SECONDS
-        )
+        async with send_deadline(SEND_TIMEOUT_SECONDS):
+            await session.genai_session.send(input=text, end_of_turn=True)
 
         logger.info("✅ Text sent via send()")
 
@@ -386,12 +461,10 @@ async def handle_tool_response(session: SessionState, data: dict, websocket: Any
 
         # SDK-COMPLIANT: Send tool response with function_responses= parameter
         # FIXED: Use function_responses= parameter
-        await asyncio.wait_for(
-            session.genai_session.send_tool_response(
+        async with send_deadline(SEND_TIMEOUT_SECONDS):
+            await session.genai_session.send_tool_response(
                 function_responses=tool_data
-            ),
-            timeout=SEND_TIMEOUT_SECONDS
-        )
+            )
 
         logger.info("✅ Tool response sent")
 
@@ -400,6 +473,15 @@ async def handle_tool_response(session: SessionState, data: dict, websocket: Any
         raise
 
 
+# Client message type -> handler(session, data, websocket)
+MESSAGE_HANDLERS = {
+    "audio": handle_audio_input,
+    "image": handle_image_input,
+    "text": handle_text_input,
+    "tool_response": handle_tool_response,
+}
+
+
 async def handle_gemini_responses(websocket: Any, session: SessionState) -> None:
     """
     SDK-COMPLIANT: Handle responses from Gemini using session.receive().
@@ -420,30 +502,28 @@ async def handle_gemini_responses(websocket: Any, session: SessionState) -> None
                     response_count += 1
 
                     # SDK-COMPLIANT: Handle setup_complete
-                    if hasattr(response, 'setup_complete') and response.setup_complete:
+                    if getattr(response, 'setup_complete', None):
                         logger.info("✅ Setup complete acknowledged")
-                        await websocket.send(json.dumps({
-                            "type": "setup_complete"
-                        }))
+                        await websocket.send(SETUP_COMPLETE_MESSAGE)
                         continue
 
                     # SDK-COMPLIANT: Handle tool_call (function calling)
                     # CRITICAL: Process tool_call BEFORE server_content to ensure
                     # frontend receives tool_call message before audio starts playing
                     # This allows video state to switch before audio playback begins
-                    if hasattr(response, 'tool_call') and response.tool_call:
-                        logger.info(f"🔧 Tool call received: {response.tool_call}")
+                    tool_call = getattr(response, 'tool_call', None)
+                    if tool_call:
+                        logger.info(f"🔧 Tool call received: {tool_call}")
                         # SDK structure: tool_call.function_calls is an array
-                        for function_call in response.tool_call.function_calls:
+                        for function_call in tool_call.function_calls:
                             logger.info(f"   Calling function: {function_call.name} (id={function_call.id})")
 
                             # Fixed: Issue #56 - debounce rapid duplicate tool calls (2 second cooldown)
-                            from datetime import datetime, timedelta
-                            now = datetime.now()
+                            now = time.monotonic()
                             should_skip = False
                             if (session.last_tool_call_name == function_call.name and
-                                session.last_tool_call_time and
-                                (now - session.last_tool_call_time).total_seconds() < 2.0):
+                                session.last_tool_call_time is not None and
+                                now - session.last_tool_call_time < TOOL_CALL_COOLDOWN_SECONDS):
                                 logger.warning(f"   ⚠️ Skipping duplicate tool call within cooldown: {function_call.name}")
                                 should_skip = True
                             else:
@@ -452,27 +532,19 @@ async def handle_gemini_responses(websocket: Any, session: SessionState) -> None
 
                             if should_skip:
                                 # Still send tool_response to acknowledge
-                                tool_response = types.LiveClientToolResponse(
-                                    function_responses=[
-                                        types.FunctionResponse(
-                                            id=function_call.id,
-                                            name=function_call.name,
-                                            response={"success": False, "reason": "Duplicate call within cooldown"}
-                                        )
-                                    ]
-                                )
+                                tool_response = build_tool_response(function_call, TOOL_DUPLICATE_RESPONSE)
                                 await session.genai_session.send(tool_response)
                                 continue
                             # Fixed: Issue #54 - add error handling for tool forwarding
                             try:
                                 # Fixed: Issue #69 - add timestamp for debugging
-                                await websocket.send(json.dumps({
+                                await websocket.send(dumps({
                                     "type": "tool_call",
                                     "data": {
                                         "name": function_call.name,
                                         "args": function_call.args,
                                         "id": function_call.id,
-                                        "timestamp": now.isoformat()
+                                        "timestamp": datetime.now().isoformat()
                                     }
                                 }))
                                 logger.info(f"   ✅ Tool call forwarded to frontend: {function_call.name}")
@@ -484,15 +556,7 @@ async def handle_gemini_responses(websocket: Any, session: SessionState) -> None
                             # SDK-COMPLIANT: Send tool_response back to Gemini
                             # This acknowledges the tool execution and prevents re-triggering
                             # Fixed: Issue #34 - added logging for successful tool execution
-                            tool_response = types.LiveClientToolResponse(
-                                function_responses=[
-                                    types.FunctionResponse(
-                                        id=function_call.id,
-                                        name=function_call.name,
-                                        response={"success": True}
-                                    )
-                                ]
-                            )
+                            tool_response = build_tool_response(function_call, TOOL_SUCCESS_RESPONSE)
                             await session.genai_session.send(tool_response)
                             logger.info(f"   ✅ Tool response sent to Gemini: success=True (id={function_call.id})")
 
@@ -503,24 +567,22 @@ async def handle_gemini_responses(websocket: Any, session: SessionState) -> None
                         await process_server_content(websocket, session, server_content)
 
                     # SDK-COMPLIANT: Handle usage_metadata
-                    if hasattr(response, 'usage_metadata') and response.usage_metadata:
-                        logger.info(f"📊 Usage metadata: {response.usage_metadata}")
-                        session.total_tokens = getattr(response.usage_metadata, 'total_token_count', 0)
+                    usage_metadata = getattr(response, 'usage_metadata', None)
+                    if usage_metadata:
+                        logger.info(f"📊 Usage metadata: {usage_metadata}")
+                        session.total_tokens = getattr(usage_metadata, 'total_token_count', 0)
 
                     # SDK-COMPLIANT: Handle go_away (graceful shutdown)
-                    if hasattr(response, 'go_away') and response.go_away:
+                    if getattr(response, 'go_away', None):
                         logger.info("🚪 Server requested disconnect (go_away)")
-                        await websocket.send(json.dumps({
-                            "type": "go_away",
-                            "data": {"message": "Server closing session"}
-                        }))
+                        await websocket.send(GO_AWAY_MESSAGE)
                         break
 
                 except Exception as e:
-                    logger.error(f"Error processing Gemini response: {e}")
-                    logger.error(traceback.format_exc())
+                    logger.error(f"Error processing Gemini response: {e}", exc_info=True)
 
     finally:
+        cancel_pending_caption(session)
         logger.debug("handle_gemini_responses finished")
 
 
@@ -529,10 +591,13 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
     SDK-COMPLIANT: Process server_content including audio, text, and interruptions.
     """
     try:
+        # Read once: used by both the greeting skip and the end-of-turn handling
+        turn_complete = getattr(server_content, 'turn_complete', None)
+
         # Skip forwarding initial greeting from KV cache preload
         if session.skip_initial_greeting:
             # Check for turn_complete to know when KV cache processing is done
-            if hasattr(server_content, 'turn_complete') and server_content.turn_complete:
+            if turn_complete:
                 logger.info("✅ KV cache greeting consumed (not forwarded)")
                 session.skip_initial_greeting = False
             else:
@@ -540,12 +605,10 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
             return
 
         # SDK-COMPLIANT: Check for interruption
-        if hasattr(server_content, 'interrupted') and server_content.interrupted:
+        if getattr(server_content, 'interrupted', None):
             logger.info("⚠️ Interruption detected")
-            await websocket.send(json.dumps({
-                "type": "interrupted",
-                "data": {"message": "Response interrupted"}
-            }))
+            cancel_pending_caption(session)
+            await websocket.send(INTERRUPTED_MESSAGE)
             session.is_receiving_response = False
             session.client_interrupted = False  # Reset flag
             return
@@ -570,7 +633,7 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
                 inline_data = getattr(part, 'inline_data', None)
                 if inline_data:
                     # Audio data is raw bytes - encode to base64 for client
-                    audio_base64 = base64.b64encode(inline_data.data).decode('utf-8')
+                    audio_base64 = encode_audio_base64(inline_data.data)
 
                     # Send audio to client for playback
                     # Use string concatenation instead of json.dumps for simple messages (faster)
@@ -580,8 +643,11 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
                 else:
                     text = getattr(part, 'text', None)
                     if text:
-                        # Use json.dumps for text (handles control characters properly)
-                        await websocket.send(json.dumps({
+                        # Text part (alternative to output_transcription)
+                        if CAPTIONS_ENABLED:
+                            logger.info(f"📄 Model text part: '{text}'")
+                        # Use dumps for text (handles control characters properly)
+                        await websocket.send(dumps({
                             "type": "text",
                             "data": text
                         }))
@@ -589,49 +655,41 @@ async def process_server_content(websocket: Any, session: SessionState, server_c
         # GEMINI TRANSCRIPTION: Send chunks in real-time AND accumulate
         # Reference: Gemini Live API sends transcription "in chunks, mirroring the spoken words"
         # Strategy: Send each chunk immediately for real-time display, also accumulate for final text
-        if CAPTIONS_ENABLED and hasattr(server_content, 'output_transcription'):
-            output_transcription = server_content.output_transcription
-            if output_transcription and hasattr(output_transcription, 'text'):
-                text = output_transcription.text.strip()
-                if text:
-                    logger.info(f"📝 Transcription chunk #{len(session.output_transcriptions) + 1}: '{text}'")
-                    # Accumulate for final complete text
-                    session.output_transcriptions.append(text)
-                    # Send CUMULATIVE text for real-time display (frontend expects cumulative)
-                    cumulative_text = ' '.join(session.output_transcriptions)
-                    await websocket.send(json.dumps({
-                        "type": "transcription_interim",
-                        "data": cumulative_text
-                    }))
-
-        # Check if model_turn has text parts (alternative to output_transcription)
-        if CAPTIONS_ENABLED and model_turn:
-            for part in model_turn.parts:
-                if not hasattr(part, 'inline_data'):  # Not audio
-                    text = getattr(part, 'text', None)
-                    if text:
-                        logger.info(f"📄 Model text part: '{text}'")
+        output_transcription = getattr(server_content, 'output_transcription', None) if CAPTIONS_ENABLED else None
+        if output_transcription:
+            text = (getattr(output_transcription, 'text', None) or '').strip()
+            if text:
+                logger.info(f"📝 Transcription chunk #{len(session.output_transcriptions) + 1}: '{text}'")
+                # Accumulate for final complete text (the deque drops the oldest chunk when full)
+                if (len(session.output_transcriptions) == MAX_TRANSCRIPTION_CHUNKS
+                        and not session.transcription_truncated):
+                    logger.warning(f"⚠️ Turn exceeded {MAX_TRANSCRIPTION_CHUNKS} transcription chunks - captions will lose the start of the turn")
+                    session.transcription_truncated = True
+                session.output_transcriptions.append(text)
+                # Send CUMULATIVE text for real-time display (throttled, see queue_interim_caption)
+                await queue_interim_caption(websocket, session)
 
         # SDK-COMPLIANT: Handle turn_complete
-        if hasattr(server_content, 'turn_complete') and server_content.turn_complete:
+        if turn_complete:
             logger.info(f"✅ Turn complete - accumulated {len(session.output_transcriptions)} transcription chunks")
 
             # Send accumulated transcription as complete sentence
+            # (supersedes any interim update still waiting in the throttle window)
+            cancel_pending_caption(session)
             if CAPTIONS_ENABLED and session.output_transcriptions:
                 complete_text = ' '.join(session.output_transcriptions)
                 logger.info(f"📝 Complete transcription ({len(complete_text)} chars): '{complete_text}'")
-                await websocket.send(json.dumps({
+                await websocket.send(dumps({
                     "type": "transcription",
                     "data": complete_text
                 }))
                 # Clear accumulator for next turn
                 session.output_transcriptions.clear()
+                session.transcription_truncated = False
             elif CAPTIONS_ENABLED:
                 logger.warning("⚠️ Turn complete but no transcription chunks accumulated!")
 
-            await websocket.send(json.dumps({
-                "type": "turn_complete"
-            }))
+            await websocket.send(TURN_COMPLETE_MESSAGE)
             session.is_receiving_response = False
             session.client_interrupted = False  # Reset flag
 
@@ -649,7 +707,7 @@ async def wait_for_setup_complete(session: SessionState) -> bool:
 
         async def check_setup():
             async for response in session.genai_session.receive():
-                if hasattr(response, 'setup_complete') and response.setup_complete:
+                if getattr(response, 'setup_complete', None):
                     logger.info("✅ Setup complete received")
                     return True
             return False
@@ -689,16 +747,14 @@ async def handle_client(websocket: Any) -> None:
             if initial_context_text:
                 try:
                     logger.info(f"📝 Sending initial context as message ({len(initial_context_text)} chars)")
-                    await asyncio.wait_for(
-                        gemini_session.send(input=initial_context_text, end_of_turn=True),
-                        timeout=SEND_TIMEOUT_SECONDS
-                    )
+                    async with send_deadline(SEND_TIMEOUT_SECONDS):
+                        await gemini_session.send(input=initial_context_text, end_of_turn=True)
                     logger.info("✅ Initial context message sent")
 
                     # Wait for and consume the model's acknowledgment
                     async for response in gemini_session.receive():
                         server_content = getattr(response, 'server_content', None)
-                        if server_content and hasattr(server_content, 'turn_complete') and server_content.turn_complete:
+                        if server_content and getattr(server_content, 'turn_complete', None):
                             logger.info("✅ Context acknowledged")
                             break
                         if server_content:
@@ -712,7 +768,7 @@ async def handle_client(websocket: Any) -> None:
                     logger.warning(f"⚠️ Failed to send context: {e}")
 
             # Send ready to client
-            await websocket.send(json.dumps({"ready": True}))
+            await websocket.send(READY_MESSAGE)
             logger.info(f"✅ Session {session_id} ready")
 
             # Start message handling
@@ -720,32 +776,30 @@ async def handle_client(websocket: Any) -> None:
 
     except asyncio.TimeoutError:
         logger.info(f"Session {session_id} timed out")
-        try:
+        with suppress(Exception):
             await send_error_message(websocket, {
                 "message": "Session timed out",
                 "error_type": "timeout"
             })
-        except:
-            pass
 
     except Exception as e:
-        logger.error(f"Error in handle_client: {e}")
-        logger.error(traceback.format_exc())
+        logger.error(f"Error in handle_client: {e}", exc_info=True)
 
         if "connection closed" not in str(e).lower():
-            try:
+            with suppress(Exception):
                 await send_error_message(websocket, {
                     "message": "An error occurred",
                     "error_type": "general"
                 })
-            except:
-                pass
 
     finally:
-        # SDK-COMPLIANT: Session automatically closed by async with
+        # SDK-COMPLIANT: Gemini session automatically closed by async with
+        # Client socket is usually already closed (client disconnected first)
         try:
-            await websocket.close()
-        except Exception:
-            pass
-
-        await cleanup_session(session, session_id)
+            if websocket.state is not State.CLOSED:
+                with suppress(Exception):
+                    await websocket.close()
+        finally:
+            # Runs even if this task is cancelled mid-close; shielded so the
+            # session is always dropped from active_sessions
+            await asyncio.shield(cleanup_session(session, session_id))